@@ -1,13 +1,19 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uuid # For generating unique IDs
-import time # For simulating time-based operations
-import threading # For running the simulation in a separate thread
+import time # For recording crawl start times
+import asyncio # For simulating crawl work without blocking the event loop
+import logging # For crawl progress messages
 
 # Initialize FastAPI app
-app = FastAPI()
+# ORJSONResponse serializes responses with orjson, which is faster than the stdlib json module.
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Log through uvicorn's error logger so messages show up next to the server output.
+# Messages use %-style arguments, so they are only formatted if the level is enabled.
+logger = logging.getLogger("uvicorn.error")
 
 # Configure CORS 
 # Adjust the 'origins' list to include the actual URL(s) where your frontend is hosted.
@@ -29,6 +35,9 @@ app.add_middleware(
 # Dictionary stores crawl statuses and simulated results in memory.
 crawl_jobs = {}
 
+# Job statuses for which /results can return (possibly partial) results.
+RESULTS_AVAILABLE_STATUSES = frozenset({'complete', 'running'})
+
 # Pydantic model for validating the request body when starting a crawl.
 # FastAPI uses this to automatically validate incoming JSON data.
 class CrawlRequest(BaseModel):
@@ -43,8 +52,23 @@ class PageRow(BaseModel):
     type: str # e.g., "html", "pdf", "doc"
     size: int # size in bytes
 
+# Mock pages returned by the simulated crawl. Built once at import time and
+# shared by every run, since the pages are only ever read.
+MOCK_PAGES = (
+    {"id": "1", "path": "/", "title": "Home Page", "type": "html", "size": 18322},
+    {"id": "2", "path": "/products", "title": "Our Products", "type": "html", "size": 25101},
+    {"id": "3", "path": "/contact", "title": "Contact Us", "type": "html", "size": 19552},
+    {"id": "4", "path": "/about-us", "title": "About Our Company", "type": "html", "size": 30000},
+    {"id": "5", "path": "/services", "title": "Our Services", "type": "html", "size": 150000},
+    {"id": "6", "path": "/blog/latest", "title": "Latest Blog Post", "type": "html", "size": 22000},
+    {"id": "7", "path": "/privacy-policy.pdf", "title": "Privacy Policy", "type": "pdf", "size": 12000},
+    {"id": "8", "path": "/terms-of-service", "title": "Terms and Conditions", "type": "html", "size": 28000},
+    {"id": "9", "path": "/careers", "title": "Careers at Our Company", "type": "html", "size": 17000},
+    {"id": "10", "path": "/faq", "title": "Frequently Asked Questions", "type": "html", "size": 80000},
+)
+
 # --- Helper Function: Simulates the Norconex Crawler ---
-def run_norconex_crawler_simulation(run_id: str, target_url: str):
+async def run_norconex_crawler_simulation(run_id: str, target_url: str):
     """
     This function simulates the asynchronous web crawling process.
     In a production setup, this is where you would integrate with the
@@ -52,45 +76,37 @@ def run_norconex_crawler_simulation(run_id: str, target_url: str):
 
     It updates the 'crawl_jobs' dictionary to reflect the current status
     and progressively adds simulated page results.
+
+    It is a coroutine so FastAPI runs it on the event loop instead of tying up
+    a threadpool worker for the whole (mostly idle) crawl.
     """
-    print(f"[{run_id}] Simulating crawl for: {target_url}")
+    logger.info("[%s] Simulating crawl for: %s", run_id, target_url)
+    # Look up the job record once; the loop below updates it in place
+    job = crawl_jobs[run_id]
     # Update job status to 'running' and reset progress
-    crawl_jobs[run_id]['status'] = 'running'
-    crawl_jobs[run_id]['progress'] = 0
-
-    # Define a list of mock pages that will be crawled
-    mock_pages = [
-        {"id": "1", "path": "/", "title": "Home Page", "type": "html", "size": 18322},
-        {"id": "2", "path": "/products", "title": "Our Products", "type": "html", "size": 25101},
-        {"id": "3", "path": "/contact", "title": "Contact Us", "type": "html", "size": 19552},
-        {"id": "4", "path": "/about-us", "title": "About Our Company", "type": "html", "size": 30000},
-        {"id": "5", "path": "/services", "title": "Our Services", "type": "html", "size": 150000},
-        {"id": "6", "path": "/blog/latest", "title": "Latest Blog Post", "type": "html", "size": 22000},
-        {"id": "7", "path": "/privacy-policy.pdf", "title": "Privacy Policy", "type": "pdf", "size": 12000},
-        {"id": "8", "path": "/terms-of-service", "title": "Terms and Conditions", "type": "html", "size": 28000},
-        {"id": "9", "path": "/careers", "title": "Careers at Our Company", "type": "html", "size": 17000},
-        {"id": "10", "path": "/faq", "title": "Frequently Asked Questions", "type": "html", "size": 80000},
-    ]
+    job['status'] = 'running'
+    job['progress'] = 0
 
     # Loop through mock pages to simulate crawling progress
-    for i, page in enumerate(mock_pages):
-        time.sleep(1) # Pause for 1 second to simulate work
-        # Calculate progress percentage
-        current_progress = int(((i + 1) / len(mock_pages)) * 100)
-        crawl_jobs[run_id]['progress'] = current_progress
+    total_pages = len(MOCK_PAGES)
+    for i, page in enumerate(MOCK_PAGES):
+        await asyncio.sleep(1) # Pause for 1 second to simulate work
+        # Calculate progress percentage (integer math avoids float rounding, e.g. 29/100 -> 28)
+        current_progress = (i + 1) * 100 // total_pages
+        job['progress'] = current_progress
         # Add the "crawled" page to the results list for this job
-        crawl_jobs[run_id]['results'].append(page)
-        print(f"[{run_id}] Progress: {crawl_jobs[run_id]['progress']}% - Added {page['path']}")
+        job['results'].append(page)
+        logger.debug("[%s] Progress: %s%% - Added %s", run_id, current_progress, page['path'])
 
     # After all pages are "crawled", set the final status
     # This example includes a simple error simulation based on the URL
     if "error" in target_url:
-        crawl_jobs[run_id]['status'] = 'failed'
-        crawl_jobs[run_id]['error_message'] = 'Simulated crawl failure due to target URL containing "error".'
-        print(f"[{run_id}] Crawl failed for {target_url}")
+        job['status'] = 'failed'
+        job['error_message'] = 'Simulated crawl failure due to target URL containing "error".'
+        logger.info("[%s] Crawl failed for %s", run_id, target_url)
     else:
-        crawl_jobs[run_id]['status'] = 'complete'
-        print(f"[{run_id}] Crawl complete for {target_url}")
+        job['status'] = 'complete'
+        logger.info("[%s] Crawl complete for %s", run_id, target_url)
 
 # --- API Endpoints ---
 
@@ -123,7 +139,7 @@ async def start_crawl(request: CrawlRequest, background_tasks: BackgroundTasks):
     background_tasks.add_task(run_norconex_crawler_simulation, run_id, target_url)
 
     # Return a 202 Accepted response, indicating the request has been taken for processing.
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "message": "Crawl initiated successfully",
         "run_id": run_id,
         "status": "pending"
@@ -142,14 +158,14 @@ async def get_crawl_status(run_id: str):
         raise HTTPException(status_code=404, detail="Crawl run not found")
 
     # Return the current status details of the job
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "run_id": run_id,
         "target_url": job['target_url'],
         "status": job['status'],
         "progress": job['progress'],
         "started_at": job['started_at'],
         "num_pages_indexed": len(job['results']), # Count of pages currently indexed
-        "error_message": job.get('error_message') # Get error message if exists
+        "error_message": job['error_message'] # Always initialized by start_crawl (None until a failure)
     })
 
 @app.get("/results/{run_id}", response_model=list[PageRow])
@@ -166,7 +182,7 @@ async def get_crawl_results(run_id: str):
 
     # Return the results if the crawl is complete or still in progress (with partial results).
     # If it's pending or failed without results, return a 409 Conflict.
-    if job['status'] in ['complete', 'running']:
+    if job['status'] in RESULTS_AVAILABLE_STATUSES:
         return job['results']
     else:
         raise HTTPException(status_code=409, detail="Crawl not yet complete or results not available")